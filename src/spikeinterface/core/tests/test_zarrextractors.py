@@ -1,6 +1,7 @@
 import pytest
 from pathlib import Path
 
+import numpy as np
 import zarr
 
 from spikeinterface.core import (
@@ -10,7 +11,12 @@ from spikeinterface.core import (
     generate_sorting,
     load,
 )
-from spikeinterface.core.zarrextractors import add_sorting_to_zarr_group, get_default_zarr_compressor
+from spikeinterface.core.zarrextractors import (
+    add_sorting_to_zarr_group,
+    get_default_zarr_compressor,
+    MemoryMappedDirectoryStore,
+    _resolve_zarr_pool_engine,
+)
 
 
 def test_zarr_compression_options(tmp_path):
@@ -56,6 +62,118 @@ def test_zarr_compression_options(tmp_path):
     assert rec_other._root["times_seg0"].filters == other_filters2
 
 
+def test_zarr_get_traces(tmp_path):
+    recording = generate_recording(num_channels=6, durations=[2])
+    # small chunks so that the read spans several of them
+    ZarrRecordingExtractor.write_recording(recording, tmp_path / "rec.zarr", chunk_size=1000)
+    rec_zarr = ZarrRecordingExtractor(tmp_path / "rec.zarr")
+
+    traces = recording.get_traces(start_frame=100, end_frame=5000)
+    for channel_indices in (None, [3, 1], np.array([0, 5, 2]), slice(1, 4)):
+        traces_zarr = rec_zarr._recording_segments[0].get_traces(
+            start_frame=100, end_frame=5000, channel_indices=channel_indices
+        )
+        expected = traces if channel_indices is None else traces[:, channel_indices]
+        assert traces_zarr.shape == expected.shape
+        assert np.array_equal(traces_zarr, expected)
+
+    # out of range frames are clipped and other selections fall back to numpy semantics
+    num_samples = recording.get_num_samples()
+    traces_end = recording.get_traces(start_frame=num_samples - 100, end_frame=num_samples)
+    traces_zarr = rec_zarr._recording_segments[0].get_traces(start_frame=num_samples - 100, end_frame=num_samples + 50)
+    assert np.array_equal(traces_zarr, traces_end)
+    traces_zarr = rec_zarr._recording_segments[0].get_traces(start_frame=-10, end_frame=100)
+    assert np.array_equal(traces_zarr, recording.get_traces(start_frame=0, end_frame=100))
+    mask = np.array([True, False, True, False, False, True])
+    for channel_indices in (mask, slice(None, None, -1)):
+        traces_zarr = rec_zarr._recording_segments[0].get_traces(
+            start_frame=100, end_frame=5000, channel_indices=channel_indices
+        )
+        assert np.array_equal(traces_zarr, traces[:, channel_indices])
+
+    # local stores are not prefetched
+    assert len(rec_zarr._recording_segments[0]._prefetched_chunks) == 0
+
+    # sequential reads, served partly from prefetched chunks (as for remote stores)
+    rec_zarr = ZarrRecordingExtractor(tmp_path / "rec.zarr")
+    rec_zarr._recording_segments[0]._prefetch = True
+    for start_frame in range(0, 20000, 730):
+        end_frame = start_frame + 730
+        traces_zarr = rec_zarr.get_traces(start_frame=start_frame, end_frame=end_frame)
+        assert np.array_equal(traces_zarr, recording.get_traces(start_frame=start_frame, end_frame=end_frame))
+    assert len(rec_zarr._recording_segments[0]._prefetched_chunks) > 0
+
+
+def test_zarr_failed_prefetch(tmp_path):
+    recording = generate_recording(num_channels=4, durations=[2])
+    ZarrRecordingExtractor.write_recording(recording, tmp_path / "rec.zarr", chunk_size=1000)
+    rec_zarr = ZarrRecordingExtractor(tmp_path / "rec.zarr")
+    segment = rec_zarr._recording_segments[0]
+    segment._prefetch = True
+
+    # the first background load fails, as a transient network error would
+    load_chunk = segment._load_chunk
+    failures = []
+
+    def failing_load_chunk(chunk_index):
+        if not failures:
+            failures.append(chunk_index)
+            raise OSError("transient error")
+        return load_chunk(chunk_index)
+
+    segment._load_chunk = failing_load_chunk
+    rec_zarr.get_traces(start_frame=0, end_frame=500)
+    rec_zarr.get_traces(start_frame=500, end_frame=1000)
+    for _ in range(3):
+        traces_zarr = rec_zarr.get_traces(start_frame=1000, end_frame=1500)
+        assert np.array_equal(traces_zarr, recording.get_traces(start_frame=1000, end_frame=1500))
+    assert failures == [1]
+
+
+def test_zarr_pool_engine(tmp_path):
+    local_group = zarr.open(str(tmp_path / "rec.zarr"), mode="w")
+
+    # threads are opt-in
+    assert "pool_engine" not in _resolve_zarr_pool_engine(local_group, False, dict(n_jobs=2))
+    assert _resolve_zarr_pool_engine(local_group, True, dict(n_jobs=2))["pool_engine"] == "thread"
+
+    # an explicit engine is never overridden
+    with pytest.warns(UserWarning):
+        job_kwargs = _resolve_zarr_pool_engine(local_group, True, dict(n_jobs=2, pool_engine="process"))
+    assert job_kwargs["pool_engine"] == "process"
+
+    recording = generate_recording(num_channels=4, durations=[2])
+    ZarrRecordingExtractor.write_recording(recording, tmp_path / "rec_threads.zarr", use_threads=True, n_jobs=2)
+    rec_zarr = ZarrRecordingExtractor(tmp_path / "rec_threads.zarr")
+    assert np.array_equal(rec_zarr.get_traces(), recording.get_traces())
+
+
+def test_zarr_use_mmap(tmp_path):
+    recording = generate_recording(num_channels=6, durations=[2])
+    ZarrRecordingExtractor.write_recording(recording, tmp_path / "rec_raw.zarr", compressor=None, chunk_size=1000)
+    rec_mmap = ZarrRecordingExtractor(tmp_path / "rec_raw.zarr", use_mmap=True)
+    assert isinstance(rec_mmap._recording_segments[0]._timeseries.store, MemoryMappedDirectoryStore)
+    traces = rec_mmap.get_traces(start_frame=100, end_frame=5000, channel_ids=rec_mmap.channel_ids[[4, 1]])
+    assert np.array_equal(traces, recording.get_traces(start_frame=100, end_frame=5000)[:, [4, 1]])
+
+    # compressed traces cannot be memory-mapped
+    ZarrRecordingExtractor.write_recording(recording, tmp_path / "rec_compressed.zarr")
+    with pytest.warns(UserWarning):
+        rec_compressed = ZarrRecordingExtractor(tmp_path / "rec_compressed.zarr", use_mmap=True)
+    assert not isinstance(rec_compressed._recording_segments[0]._timeseries.store, MemoryMappedDirectoryStore)
+
+
+def test_zarr_compression_ratio(tmp_path):
+    recording = generate_recording(durations=[2, 1])
+    ZarrRecordingExtractor.write_recording(recording, tmp_path / "rec.zarr")
+    rec_zarr = ZarrRecordingExtractor(tmp_path / "rec.zarr", load_compression_ratio=True)
+
+    cr_by_segment = rec_zarr.get_annotation("compression_ratio_segments")
+    for segment_index in range(recording.get_num_segments()):
+        traces_dataset = rec_zarr._root[f"traces_seg{segment_index}"]
+        assert cr_by_segment[segment_index] == traces_dataset.nbytes / traces_dataset.nbytes_stored
+
+
 def test_ZarrSortingExtractor(tmp_path):
     np_sorting = generate_sorting()
 
@@ -63,6 +181,7 @@ def test_ZarrSortingExtractor(tmp_path):
     folder = tmp_path / "zarr_sorting"
     ZarrSortingExtractor.write_sorting(np_sorting, folder)
     sorting = ZarrSortingExtractor(folder)
+    assert np.array_equal(sorting.to_spike_vector(), np_sorting.to_spike_vector())
     sorting = load(sorting.to_dict())
 
     # store the sorting in a sub group (for instance SortingResult)
@@ -78,4 +197,9 @@ def test_ZarrSortingExtractor(tmp_path):
 if __name__ == "__main__":
     tmp_path = Path("tmp")
     test_zarr_compression_options(tmp_path)
+    test_zarr_get_traces(tmp_path)
+    test_zarr_failed_prefetch(tmp_path)
+    test_zarr_pool_engine(tmp_path)
+    test_zarr_use_mmap(tmp_path)
+    test_zarr_compression_ratio(tmp_path)
     test_ZarrSortingExtractor(tmp_path)
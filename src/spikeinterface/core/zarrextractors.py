@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import mmap
+import os
+import threading
 import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import numpy as np
 import zarr
@@ -45,8 +50,6 @@ def super_zarr_open(folder_path: str | Path, mode: str = "r", storage_options: d
     ValueError
         Raised if the folder cannot be opened in the specified mode with the given storage options.
     """
-    import zarr
-
     # if mode is append or read/write, we try to open the folder with zarr.open
     # since zarr.open_consolidated does not support creating new groups/datasets
     if mode in ("a", "r+"):
@@ -91,6 +94,25 @@ def super_zarr_open(folder_path: str | Path, mode: str = "r", storage_options: d
     return root
 
 
+class MemoryMappedDirectoryStore(zarr.storage.DirectoryStore):
+    """
+    DirectoryStore returning memory-mapped buffers for chunk files.
+
+    For uncompressed arrays, chunks are then decoded as views on the mapped files, so that
+    only the pages touched by a selection are read from disk (or from the OS page cache).
+    Metadata files are read normally.
+    """
+
+    def _fromfile(self, fn):
+        if Path(fn).name.startswith("."):
+            return super()._fromfile(fn)
+        with open(fn, "rb") as f:
+            # empty files cannot be memory-mapped
+            if os.fstat(f.fileno()).st_size == 0:
+                return f.read()
+            return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
 class ZarrRecordingExtractor(BaseRecording):
     """
     RecordingExtractor for a zarr format
@@ -107,6 +129,10 @@ class ZarrRecordingExtractor(BaseRecording):
         Storage options for zarr `store`. E.g., if "s3://" or "gcs://" they can provide authentication methods, etc.
     load_compression_ratio : bool, default: False
         If True, the compression ratio is loaded from the zarr file and annotated in the recording.
+    use_mmap : bool, default: False
+        If True and the traces are stored locally without compressor nor filters, the chunk files
+        are memory-mapped. This speeds up reads of a few channels or short time ranges, since only
+        the required bytes are loaded.
 
     Returns
     -------
@@ -115,23 +141,33 @@ class ZarrRecordingExtractor(BaseRecording):
     """
 
     def __init__(
-        self, folder_path: Path | str, storage_options: dict | None = None, load_compression_ratio: bool = False
+        self,
+        folder_path: Path | str,
+        storage_options: dict | None = None,
+        load_compression_ratio: bool = False,
+        use_mmap: bool = False,
+        _opened_root: zarr.hierarchy.Group | None = None,
     ):
 
         folder_path, folder_path_kwarg = resolve_zarr_path(folder_path)
 
-        self._root = super_zarr_open(folder_path, mode="r", storage_options=storage_options)
+        if _opened_root is None:
+            self._root = super_zarr_open(folder_path, mode="r", storage_options=storage_options)
+        else:
+            self._root = _opened_root
 
-        sampling_frequency = self._root.attrs.get("sampling_frequency", None)
-        num_segments = self._root.attrs.get("num_segments", None)
+        # fetch all the attributes at once, each access can hit the store on non-consolidated backends
+        attrs = self._root.attrs.asdict()
+        sampling_frequency = attrs.get("sampling_frequency", None)
+        num_segments = attrs.get("num_segments", None)
         assert "channel_ids" in self._root.keys(), "'channel_ids' dataset not found!"
-        channel_ids = self._root["channel_ids"][:]
+        channel_ids_dataset = self._root["channel_ids"]
+        num_channels = channel_ids_dataset.shape[0]
+        channel_ids = channel_ids_dataset[:]
 
         assert sampling_frequency is not None, "'sampling_frequency' attiribute not found!"
         assert num_segments is not None, "'num_segments' attiribute not found!"
 
-        channel_ids = np.array(channel_ids)
-
         dtype = self._root["traces_seg0"].dtype
 
         BaseRecording.__init__(self, sampling_frequency, channel_ids, dtype)
@@ -139,14 +175,29 @@ class ZarrRecordingExtractor(BaseRecording):
         dtype = np.dtype(dtype)
         t_starts = self._root.get("t_starts", None)
 
+        traces_root = self._root
+        if use_mmap:
+            trace_names = [f"traces_seg{segment_index}" for segment_index in range(num_segments)]
+            if is_path_remote(str(folder_path)):
+                warnings.warn("use_mmap is only available for local zarr folders: traces are read normally")
+            elif any(
+                self._root[name].compressor is not None or self._root[name].filters is not None for name in trace_names
+            ):
+                warnings.warn("use_mmap requires traces without compressor nor filters: traces are read normally")
+            else:
+                traces_root = zarr.open_group(MemoryMappedDirectoryStore(str(folder_path)), mode="r")
+
         if load_compression_ratio:
             total_nbytes = 0
             total_nbytes_stored = 0
             cr_by_segment = {}
+            nbytes_stored_by_name = get_zarr_nbytes_stored(
+                self._root, [f"traces_seg{segment_index}" for segment_index in range(num_segments)]
+            )
         for segment_index in range(num_segments):
             trace_name = f"traces_seg{segment_index}"
             assert (
-                len(channel_ids) == self._root[trace_name].shape[1]
+                num_channels == self._root[trace_name].shape[1]
             ), f"Segment {segment_index} has the wrong number of channels!"
 
             time_kwargs = {}
@@ -163,12 +214,15 @@ class ZarrRecordingExtractor(BaseRecording):
                 time_kwargs["t_start"] = t_start
                 time_kwargs["sampling_frequency"] = sampling_frequency
 
-            rec_segment = ZarrRecordingSegment(self._root, trace_name, **time_kwargs)
+            # prefetching only hides the latency of remote stores, locally it would just hold whole chunks in memory
+            rec_segment = ZarrRecordingSegment(
+                traces_root, trace_name, prefetch=is_path_remote(str(folder_path)), **time_kwargs
+            )
             self.add_recording_segment(rec_segment)
 
             if load_compression_ratio:
                 nbytes_segment = self._root[trace_name].nbytes
-                nbytes_stored_segment = self._root[trace_name].nbytes_stored
+                nbytes_stored_segment = nbytes_stored_by_name[trace_name]
                 if nbytes_stored_segment > 0:
                     cr_by_segment[segment_index] = nbytes_segment / nbytes_stored_segment
                 else:
@@ -178,7 +232,7 @@ class ZarrRecordingExtractor(BaseRecording):
                 total_nbytes_stored += nbytes_stored_segment
 
         # load probe
-        probe_dict = self._root.attrs.get("probe", None)
+        probe_dict = attrs.get("probe", None)
         if probe_dict is not None:
             probegroup = ProbeGroup.from_dict(probe_dict)
             self.set_probegroup(probegroup, in_place=True)
@@ -191,7 +245,7 @@ class ZarrRecordingExtractor(BaseRecording):
                 self.set_property(key, values)
 
         # load annotations
-        annotations = self._root.attrs.get("annotations", None)
+        annotations = attrs.get("annotations", None)
         if annotations is not None:
             self.annotate(**annotations)
         if load_compression_ratio:
@@ -206,20 +260,54 @@ class ZarrRecordingExtractor(BaseRecording):
             "folder_path": folder_path_kwarg,
             "storage_options": storage_options,
             "load_compression_ratio": load_compression_ratio,
+            "use_mmap": use_mmap,
         }
 
     @staticmethod
     def write_recording(
         recording: BaseRecording, folder_path: str | Path, storage_options: dict | None = None, **kwargs
     ):
+        """
+        Save the traces of a recording extractor in zarr format.
+
+        Parameters
+        ----------
+        recording : RecordingExtractor
+            The recording extractor object to be saved
+        folder_path : str or Path
+            Path to the zarr root folder
+        storage_options : dict or None, default: None
+            Storage options for zarr `store`
+        **kwargs : dict
+            Zarr options (e.g. `compressor`, `filters`, `channel_chunk_size`, `dtype`) and job kwargs.
+            `use_threads=True` writes local traces with threads instead of processes,
+            see `add_traces_to_zarr()`.
+        """
         zarr_root = zarr.open(str(folder_path), mode="w", storage_options=storage_options)
         add_recording_to_zarr_group(recording, zarr_root, **kwargs)
 
 
 class ZarrRecordingSegment(BaseRecordingSegment):
-    def __init__(self, root, dataset_name, **time_kwargs):
+    # number of chunks loaded in the background after a sequential read
+    num_prefetch_chunks = 2
+    # maximum number of prefetched chunks kept in memory
+    max_prefetched_chunks = 4
+
+    def __init__(self, root, dataset_name, prefetch=False, **time_kwargs):
         BaseRecordingSegment.__init__(self, **time_kwargs)
         self._timeseries = root[dataset_name]
+        self._num_samples, self._num_channels = self._timeseries.shape
+        self._dtype = self._timeseries.dtype
+        self._chunk_size = self._timeseries.chunks[0]
+        self._num_chunks = -(-self._num_samples // self._chunk_size)
+        # thread pools are created lazily: one to decode the chunks of a read in parallel
+        # and one to prefetch the next chunks when the segment is read sequentially
+        self._executor = None
+        self._prefetch_executor = None
+        self._prefetched_chunks = OrderedDict()
+        self._prefetch_lock = threading.Lock()
+        self._last_end_frame = None
+        self._prefetch = prefetch
 
     def get_num_samples(self) -> int:
         """Returns the number of samples in this signal block
@@ -227,7 +315,7 @@ class ZarrRecordingSegment(BaseRecordingSegment):
         Returns:
             SampleIndex : Number of samples in the signal block
         """
-        return self._timeseries.shape[0]
+        return self._num_samples
 
     def get_traces(
         self,
@@ -235,11 +323,102 @@ class ZarrRecordingSegment(BaseRecordingSegment):
         end_frame: int | None = None,
         channel_indices: list[int | str] | None = None,
     ) -> np.ndarray:
-        traces = self._timeseries[start_frame:end_frame]
-        if channel_indices is not None:
-            traces = traces[:, channel_indices]
+        start_frame = 0 if start_frame is None else max(start_frame, 0)
+        end_frame = self._num_samples if end_frame is None else min(end_frame, self._num_samples)
+        if channel_indices is None:
+            channel_indices = slice(None)
+        if isinstance(channel_indices, slice):
+            direct_read = channel_indices.step is None or channel_indices.step > 0
+        else:
+            direct_read = np.asarray(channel_indices).dtype.kind in "iu"
+        if not direct_read:
+            # boolean masks and negative steps are not supported by zarr orthogonal selections
+            return self._timeseries[start_frame:end_frame][:, channel_indices]
+        if isinstance(channel_indices, slice):
+            num_channels = len(range(self._num_channels)[channel_indices])
+        else:
+            num_channels = len(channel_indices)
+
+        # decode directly into the output buffer, only touching the requested channels
+        traces = np.empty((max(end_frame - start_frame, 0), num_channels), dtype=self._dtype)
+        if end_frame <= start_frame:
+            return traces
+
+        first_chunk = start_frame // self._chunk_size
+        last_chunk = (end_frame - 1) // self._chunk_size
+        chunk_starts = [start_frame] + [c * self._chunk_size for c in range(first_chunk + 1, last_chunk + 1)]
+        chunk_ends = chunk_starts[1:] + [end_frame]
+
+        futures = []
+        for chunk_index, chunk_start, chunk_end in zip(range(first_chunk, last_chunk + 1), chunk_starts, chunk_ends):
+            out = traces[chunk_start - start_frame : chunk_end - start_frame]
+            prefetched_chunk = self._get_prefetched_chunk(chunk_index)
+            if prefetched_chunk is not None:
+                offset = chunk_index * self._chunk_size
+                out[:] = prefetched_chunk[chunk_start - offset : chunk_end - offset, channel_indices]
+            elif last_chunk > first_chunk:
+                # decompression (blosc/zstd) releases the GIL, so chunks are decoded in parallel threads
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+                futures.append(self._executor.submit(self._read_chunk, chunk_start, chunk_end, channel_indices, out))
+            else:
+                self._read_chunk(chunk_start, chunk_end, channel_indices, out)
+        for future in futures:
+            future.result()
+
+        self._prefetch_next_chunks(start_frame, end_frame)
         return traces
 
+    def _read_chunk(self, start_frame, end_frame, channel_indices, out):
+        self._timeseries.get_orthogonal_selection((slice(start_frame, end_frame), channel_indices), out=out)
+
+    def _load_chunk(self, chunk_index):
+        return self._timeseries[chunk_index * self._chunk_size : (chunk_index + 1) * self._chunk_size]
+
+    def _get_prefetched_chunk(self, chunk_index):
+        with self._prefetch_lock:
+            future = self._prefetched_chunks.get(chunk_index, None)
+            if future is not None:
+                self._prefetched_chunks.move_to_end(chunk_index)
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception:
+            # a failed prefetch (e.g. a transient network error) is dropped and the chunk is read directly
+            with self._prefetch_lock:
+                if self._prefetched_chunks.get(chunk_index, None) is future:
+                    del self._prefetched_chunks[chunk_index]
+            return None
+
+    def _prefetch_next_chunks(self, start_frame, end_frame):
+        # only sequential reads (starting where the previous one ended) trigger a prefetch
+        sequential = start_frame == self._last_end_frame
+        self._last_end_frame = end_frame
+        if not self._prefetch or not sequential:
+            return
+
+        # the chunk containing end_frame is the next one to be read
+        next_chunk = end_frame // self._chunk_size
+        with self._prefetch_lock:
+            if self._prefetch_executor is None:
+                self._prefetch_executor = ThreadPoolExecutor(max_workers=self.num_prefetch_chunks)
+            for chunk_index in range(next_chunk, min(next_chunk + self.num_prefetch_chunks, self._num_chunks)):
+                if chunk_index not in self._prefetched_chunks:
+                    self._prefetched_chunks[chunk_index] = self._prefetch_executor.submit(self._load_chunk, chunk_index)
+            while len(self._prefetched_chunks) > self.max_prefetched_chunks:
+                self._prefetched_chunks.popitem(last=False)
+
+    def __del__(self):
+        # Ensure that the threads are released when the segment is garbage-collected
+        try:
+            for executor in (getattr(self, "_executor", None), getattr(self, "_prefetch_executor", None)):
+                if executor is not None:
+                    executor.shutdown(wait=False, cancel_futures=True)
+        except Exception:
+            # at interpreter shutdown the concurrent.futures module may already be torn down
+            pass
+
 
 class ZarrSortingExtractor(BaseSorting):
     """
@@ -263,37 +442,61 @@ class ZarrSortingExtractor(BaseSorting):
         The sorting Extractor
     """
 
-    def __init__(self, folder_path: Path | str, storage_options: dict | None = None, zarr_group: str | None = None):
+    def __init__(
+        self,
+        folder_path: Path | str,
+        storage_options: dict | None = None,
+        zarr_group: str | None = None,
+        _opened_root: zarr.hierarchy.Group | None = None,
+    ):
 
         folder_path, folder_path_kwarg = resolve_zarr_path(folder_path)
 
-        zarr_root = super_zarr_open(folder_path, mode="r", storage_options=storage_options)
+        if _opened_root is None:
+            zarr_root = super_zarr_open(folder_path, mode="r", storage_options=storage_options)
+        else:
+            zarr_root = _opened_root
 
         if zarr_group is None:
             self._root = zarr_root
         else:
             self._root = zarr_root[zarr_group]
 
-        sampling_frequency = self._root.attrs.get("sampling_frequency", None)
-        num_segments = self._root.attrs.get("num_segments", None)
+        # fetch all the attributes at once, each access can hit the store on non-consolidated backends
+        attrs = self._root.attrs.asdict()
+        sampling_frequency = attrs.get("sampling_frequency", None)
+        num_segments = attrs.get("num_segments", None)
         assert "unit_ids" in self._root.keys(), "'unit_ids' dataset not found!"
         unit_ids = self._root["unit_ids"][:]
 
         assert sampling_frequency is not None, "'sampling_frequency' attiribute not found!"
         assert num_segments is not None, "'num_segments' attiribute not found!"
 
-        unit_ids = np.array(unit_ids)
         assert "spikes" in self._root.keys(), "'spikes' dataset not found!"
         spikes_group = self._root["spikes"]
-        segment_slices_list = spikes_group["segment_slices"][:]
 
         BaseSorting.__init__(self, sampling_frequency, unit_ids)
 
-        spikes = np.zeros(len(spikes_group["sample_index"]), dtype=minimum_spike_dtype)
-        spikes["sample_index"] = spikes_group["sample_index"][:]
-        spikes["unit_index"] = spikes_group["unit_index"][:]
-        for i, (start, end) in enumerate(segment_slices_list):
-            spikes["segment_index"][start:end] = i
+        # all fields are fully written below, so there is no need to zero-fill
+        num_spikes = spikes_group["sample_index"].shape[0]
+        spikes = np.empty(num_spikes, dtype=minimum_spike_dtype)
+
+        # the spike fields are independent datasets: fetch them concurrently to overlap the store latency,
+        # and decode sample_index and unit_index directly into the spike vector fields
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            segment_slices_future = executor.submit(spikes_group["segment_slices"].get_basic_selection, slice(None))
+            field_futures = [
+                executor.submit(spikes_group[field].get_basic_selection, slice(None), out=spikes[field])
+                for field in ("sample_index", "unit_index")
+            ]
+            segment_slices_list = segment_slices_future.result()
+            for future in field_futures:
+                future.result()
+
+        segment_lengths = segment_slices_list[:, 1] - segment_slices_list[:, 0]
+        spikes["segment_index"] = np.repeat(
+            np.arange(len(segment_slices_list), dtype=spikes["segment_index"].dtype), segment_lengths
+        )
 
         for segment_index in range(num_segments):
             soring_segment = SpikeVectorSortingSegment(spikes, segment_index, unit_ids)
@@ -307,7 +510,7 @@ class ZarrSortingExtractor(BaseSorting):
                 self.set_property(key, values)
 
         # load annotations
-        annotations = self._root.attrs.get("annotations", None)
+        annotations = attrs.get("annotations", None)
         if annotations is not None:
             self.annotate(**annotations)
 
@@ -347,10 +550,11 @@ def read_zarr(
     # TODO @alessio : we should have something more explicit in our zarr format to tell which object it is.
     # for the futur SortingAnalyzer we will have this 2 fields!!!
     root = super_zarr_open(folder_path, mode="r", storage_options=storage_options)
+    # the root is passed to the extractors to avoid opening it twice
     if "channel_ids" in root.keys():
-        return read_zarr_recording(folder_path, storage_options=storage_options)
+        return ZarrRecordingExtractor(folder_path, storage_options=storage_options, _opened_root=root)
     elif "unit_ids" in root.keys():
-        return read_zarr_sorting(folder_path, storage_options=storage_options)
+        return ZarrSortingExtractor(folder_path, storage_options=storage_options, _opened_root=root)
     else:
         raise ValueError("Cannot find 'channel_ids' or 'unit_ids' in zarr root. Not a valid SpikeInterface zarr format")
 
@@ -372,6 +576,39 @@ def resolve_zarr_path(folder_path: str | Path):
         return folder_path, folder_path_kwarg
 
 
+def get_zarr_nbytes_stored(zarr_group: zarr.hierarchy.Group, array_names: list[str]) -> dict:
+    """
+    Get the number of stored bytes of several arrays of a zarr group.
+
+    For fsspec stores (e.g. remote), the sizes of all the files of the group are listed
+    in a single request and summed by array, instead of listing each array separately.
+
+    Parameters
+    ----------
+    zarr_group : zarr.hierarchy.Group
+        The zarr group containing the arrays
+    array_names : list[str]
+        The names of the arrays in the group
+
+    Returns
+    -------
+    nbytes_stored : dict
+        The number of stored bytes for each array name
+    """
+    store = zarr_group.chunk_store
+    if not isinstance(store, zarr.storage.FSStore):
+        return {name: zarr_group[name].nbytes_stored for name in array_names}
+
+    group_dir = store.dir_path(zarr_group.path).rstrip("/")
+    file_sizes = store.fs.du(group_dir, total=False, withdirs=False)
+    nbytes_stored = {name: 0 for name in array_names}
+    for file_path, size in file_sizes.items():
+        array_name = file_path[len(group_dir) :].lstrip("/").split("/", 1)[0]
+        if array_name in nbytes_stored:
+            nbytes_stored[array_name] += size
+    return nbytes_stored
+
+
 def get_default_zarr_compressor(clevel: int = 5):
     """
     Return default Zarr compressor object for good preformance in int16
@@ -438,17 +675,17 @@ def add_sorting_to_zarr_group(sorting: BaseSorting, zarr_group: zarr.hierarchy.G
     spikes = sorting.to_spike_vector()
     for field in spikes.dtype.fields:
         if field != "segment_index":
+            # sample_index is sorted within segments so Delta helps compression, unit_index is not
+            filters = [Delta(dtype=spikes[field].dtype)] if field == "sample_index" else None
             spikes_group.create_dataset(
                 name=field,
                 data=spikes[field],
                 compressor=compressor,
-                filters=[Delta(dtype=spikes[field].dtype)],
+                filters=filters,
             )
         else:
-            segment_slices = []
-            for segment_index in range(num_segments):
-                i0, i1 = np.searchsorted(spikes["segment_index"], [segment_index, segment_index + 1])
-                segment_slices.append([i0, i1])
+            segment_bounds = np.searchsorted(spikes["segment_index"], np.arange(num_segments + 1))
+            segment_slices = np.stack([segment_bounds[:-1], segment_bounds[1:]], axis=1)
             spikes_group.create_dataset(name="segment_slices", data=segment_slices, compressor=None)
 
     add_properties_and_annotations(zarr_group, sorting)
@@ -477,6 +714,10 @@ def add_recording_to_zarr_group(
     compressor_by_dataset = zarr_kwargs.pop("compressor_by_dataset", {})
     global_filters = zarr_kwargs.pop("filters", None)
     filters_by_dataset = zarr_kwargs.pop("filters_by_dataset", {})
+    use_threads = zarr_kwargs.pop("use_threads", False)
+    if "pool_engine" not in kwargs:
+        # let add_traces_to_zarr know that pool_engine was not chosen by the caller
+        job_kwargs.pop("pool_engine", None)
 
     compressor_traces = compressor_by_dataset.get("traces", global_compressor)
     filters_traces = filters_by_dataset.get("traces", global_filters)
@@ -488,6 +729,7 @@ def add_recording_to_zarr_group(
         filters=filters_traces,
         dtype=dtype,
         channel_chunk_size=channel_chunk_size,
+        use_threads=use_threads,
         verbose=verbose,
         **job_kwargs,
     )
@@ -530,6 +772,7 @@ def add_traces_to_zarr(
     dtype=None,
     compressor=None,
     filters=None,
+    use_threads=False,
     verbose=False,
     **job_kwargs,
 ):
@@ -552,6 +795,14 @@ def add_traces_to_zarr(
         Zarr compressor
     filters : list, default: None
         List of zarr filters
+    use_threads : bool, default: False
+        If True and the zarr group is stored locally (or in memory), chunks are written by threads
+        instead of processes when n_jobs > 1. This avoids serializing the recording to the workers,
+        while the compression (which releases the GIL) still runs in parallel. This is only worth it
+        when `get_traces` is cheap and thread-safe. A `pool_engine` given to this function takes
+        precedence, while a `pool_engine` set with `set_global_job_kwargs()` is overridden.
+        When processes are used, the internal blosc threads of each worker are limited to
+        `max_threads_per_worker`.
     verbose : bool, default: False
         If True, output is verbose (when chunks are used)
     {}
@@ -571,7 +822,7 @@ def add_traces_to_zarr(
     if dtype is None:
         dtype = recording.get_dtype()
 
-    job_kwargs = fix_job_kwargs(job_kwargs)
+    job_kwargs = fix_job_kwargs(_resolve_zarr_pool_engine(zarr_group, use_threads, job_kwargs))
     chunk_size = ensure_chunk_size(recording, **job_kwargs)
 
     # create zarr datasets files
@@ -595,30 +846,54 @@ def add_traces_to_zarr(
     # use executor (loop or workers)
     func = _write_zarr_chunk
     init_func = _init_zarr_worker
-    init_args = (recording, zarr_datasets, dtype)
+    # blosc compresses with several internal threads in the main thread of each process (numcodecs uses
+    # min(8, num_cores) by default): with several worker processes, limit them to avoid oversubscription
+    if job_kwargs["n_jobs"] > 1 and job_kwargs["pool_engine"] == "process":
+        blosc_nthreads = job_kwargs["max_threads_per_worker"]
+    else:
+        blosc_nthreads = None
+    init_args = (recording, zarr_datasets, dtype, blosc_nthreads)
     executor = ChunkRecordingExecutor(
         recording, func, init_func, init_args, verbose=verbose, job_name="write_zarr_recording", **job_kwargs
     )
     executor.run()
 
 
+def _resolve_zarr_pool_engine(zarr_group, use_threads, job_kwargs):
+    """
+    Select the thread engine for local zarr groups when use_threads is True,
+    unless the caller explicitly gave a pool_engine.
+    """
+    if not use_threads or not isinstance(zarr_group.store, (zarr.storage.DirectoryStore, zarr.storage.MemoryStore)):
+        return job_kwargs
+    pool_engine = job_kwargs.get("pool_engine", None)
+    if pool_engine is None:
+        job_kwargs = dict(job_kwargs, pool_engine="thread")
+    elif pool_engine != "thread":
+        warnings.warn(f"use_threads=True is ignored since pool_engine='{pool_engine}' was given")
+    return job_kwargs
+
+
 # used by write_zarr_recording + ChunkRecordingExecutor
-def _init_zarr_worker(recording, zarr_datasets, dtype):
-    import zarr
+def _init_zarr_worker(recording, zarr_datasets, dtype, blosc_nthreads=None):
+    if blosc_nthreads is not None:
+        from numcodecs import blosc
+
+        blosc.set_nthreads(blosc_nthreads)
 
     # create a local dict per worker
     worker_ctx = {}
     worker_ctx["recording"] = recording
     worker_ctx["zarr_datasets"] = zarr_datasets
     worker_ctx["dtype"] = np.dtype(dtype)
+    # buffer reused across chunks when traces need to be cast (allocated on first use)
+    worker_ctx["buffer"] = None
 
     return worker_ctx
 
 
 # used by write_zarr_recording + ChunkRecordingExecutor
 def _write_zarr_chunk(segment_index, start_frame, end_frame, worker_ctx):
-    import gc
-
     # recover variables of the worker
     recording = worker_ctx["recording"]
     dtype = worker_ctx["dtype"]
@@ -630,9 +905,14 @@ def _write_zarr_chunk(segment_index, start_frame, end_frame, worker_ctx):
         end_frame=end_frame,
         segment_index=segment_index,
     )
-    traces = traces.astype(dtype)
+    if traces.dtype != dtype:
+        # cast into the worker buffer instead of allocating a new array for each chunk
+        num_frames = end_frame - start_frame
+        buffer = worker_ctx["buffer"]
+        if buffer is None or buffer.shape[0] < num_frames:
+            buffer = np.empty((num_frames, traces.shape[1]), dtype=dtype)
+            worker_ctx["buffer"] = buffer
+        traces_cast = buffer[:num_frames]
+        np.copyto(traces_cast, traces, casting="unsafe")
+        traces = traces_cast
     zarr_dataset[start_frame:end_frame, :] = traces
-
-    # fix memory leak by forcing garbage collection
-    del traces
-    gc.collect()
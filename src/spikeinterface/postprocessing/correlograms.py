@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import importlib.util
+import os
 import warnings
 import platform
 from copy import deepcopy
@@ -29,6 +30,10 @@ if numba_spec is not None:
 else:
     HAVE_NUMBA = False
 
+# np.add.at got a fast path for plain integer indices in numpy 1.25, before that
+# np.bincount is much faster to accumulate the counts
+_HAVE_FAST_ADD_AT = np.lib.NumpyVersion(np.__version__) >= "1.25.0"
+
 
 class ComputeCorrelograms(AnalyzerExtension):
     """
@@ -270,11 +275,12 @@ def _make_bins(sorting, window_ms, bin_ms) -> tuple[np.ndarray, int, int]:
 
     window_size = int(round(fs * window_ms / 2 * 1e-3))
     bin_size = int(round(fs * bin_ms * 1e-3))
-    window_size -= window_size % bin_size
-    num_bins = 2 * int(window_size / bin_size)
-    assert num_bins >= 1, "Number of bins must be >= 1"
+    num_half_bins = window_size // bin_size
+    window_size = num_half_bins * bin_size
+    assert num_half_bins >= 1, "Number of bins must be >= 1"
 
-    bins = np.arange(-window_size, window_size + bin_size, bin_size) * 1e3 / fs
+    # the edges are counted in integer samples and only scaled to ms at the end
+    bins = np.arange(-num_half_bins, num_half_bins + 1) * (bin_size * 1e3 / fs)
 
     return bins, window_size, bin_size
 
@@ -367,20 +373,37 @@ def _compute_correlograms_numpy(sorting, window_size, bin_size):
 
     num_bins, num_half_bins = _compute_num_bins(window_size, bin_size)
 
-    correlograms = np.zeros((num_units, num_units, num_bins), dtype="int64")
-
-    for seg_index in range(num_seg):
-        spike_times = spikes[seg_index]["sample_index"]
-        spike_unit_indices = spikes[seg_index]["unit_index"]
-
-        c0 = correlogram_for_one_segment(spike_times, spike_unit_indices, window_size, bin_size)
-
-        correlograms += c0
+    # segments are independent and the array arithmetic of the kernel releases the GIL,
+    # so threads are enough to run them concurrently
+    max_workers = max(min(num_seg, os.cpu_count() or 1), 1)
+
+    def _accumulate_segments(worker_index):
+        # each worker owns one accumulator and processes a strided subset of the segments
+        correlograms = np.zeros((num_units, num_units, num_bins), dtype="int64")
+        for seg_index in range(worker_index, num_seg, max_workers):
+            # the fields of the spike vector are strided views, the kernel is faster on contiguous copies
+            spike_times = np.ascontiguousarray(spikes[seg_index]["sample_index"], dtype=np.int64)
+            spike_unit_indices = np.ascontiguousarray(spikes[seg_index]["unit_index"], dtype=np.int64)
+            correlogram_for_one_segment(
+                spike_times, spike_unit_indices, window_size, bin_size, num_units=num_units, correlograms=correlograms
+            )
+        return correlograms
+
+    if max_workers > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            worker_correlograms = list(executor.map(_accumulate_segments, range(max_workers)))
+        correlograms = worker_correlograms[0]
+        for c0 in worker_correlograms[1:]:
+            correlograms += c0
+    else:
+        correlograms = _accumulate_segments(0)
 
     return correlograms
 
 
-def correlogram_for_one_segment(spike_times, spike_unit_indices, window_size, bin_size):
+def correlogram_for_one_segment(
+    spike_times, spike_unit_indices, window_size, bin_size, num_units=None, correlograms=None, method="numpy"
+):
     """
     A very well optimized algorithm for the cross-correlation of
     spike trains, copied from the Phy package, written by Cyrille Rossant.
@@ -397,6 +420,15 @@ def correlogram_for_one_segment(spike_times, spike_unit_indices, window_size, bi
         The window size over which to perform the cross-correlation, in samples
     bin_size : int
         The size of which to bin lags, in samples.
+    num_units : int | None, default: None
+        The number of units. If None, it is inferred from the largest
+        label in `spike_unit_indices`.
+    correlograms : np.ndarray | None, default: None
+        A (num_units, num_units, num_bins) C-contiguous int64 array the counts are
+        added to. If None, a new array is allocated.
+    method : "auto" | "numba" | "numpy", default: "numpy"
+        If "numba", the numba kernel is used, which only visits the pairs of spikes
+        within the window (much faster for long windows). "auto" uses numba when it is installed.
 
     Returns
     -------
@@ -419,14 +451,32 @@ def correlogram_for_one_segment(spike_times, spike_unit_indices, window_size, bi
     masked.
 
     Finally, the indices of the (num_units, num_units, num_bins) correlogram
-    that need incrementing are done so with `ravel_multi_index()`. This repeats
-    for all shifts along the spike_train until no spikes have a corresponding
-    match within the window size.
+    that need incrementing are computed from the array shape and incremented with
+    `np.add.at()`. This repeats for all shifts along the spike_train until no
+    spikes have a corresponding match within the window size.
     """
+    assert method in ("auto", "numba", "numpy"), "method must be 'auto', 'numba' or 'numpy'"
+    if method == "auto":
+        method = "numba" if HAVE_NUMBA else "numpy"
+
     num_bins, num_half_bins = _compute_num_bins(window_size, bin_size)
-    num_units = len(np.unique(spike_unit_indices))
+    if num_units is None:
+        num_units = int(spike_unit_indices.max()) + 1 if spike_unit_indices.size > 0 else 0
+
+    if method == "numba":
+        correlograms_numba = _correlogram_for_one_segment_numba(
+            spike_times, spike_unit_indices, window_size, bin_size, num_units
+        )
+        if correlograms is None:
+            return correlograms_numba
+        correlograms += correlograms_numba
+        return correlograms
 
-    correlograms = np.zeros((num_units, num_units, num_bins), dtype="int64")
+    if correlograms is None:
+        correlograms = np.zeros((num_units, num_units, num_bins), dtype="int64")
+    else:
+        assert correlograms.shape == (num_units, num_units, num_bins) and correlograms.flags.c_contiguous
+    correlograms_flat = correlograms.ravel()
 
     # At a given shift, the mask precises which spikes have matching spikes
     # within the correlogram time window.
@@ -455,19 +505,24 @@ def correlogram_for_one_segment(spike_times, spike_unit_indices, window_size, bi
             # Find the indices in the raveled correlograms array that need
             # to be incremented, taking into account the spike unit labels.
             if sign == 1:
-                indices = np.ravel_multi_index(
-                    (spike_unit_indices[+shift:][m], spike_unit_indices[:-shift][m], spike_diff_b[m] + num_half_bins),
-                    correlograms.shape,
-                )
+                unit_a, unit_b = spike_unit_indices[+shift:][m], spike_unit_indices[:-shift][m]
             else:
-                indices = np.ravel_multi_index(
-                    (spike_unit_indices[:-shift][m], spike_unit_indices[+shift:][m], spike_diff_b[m] + num_half_bins),
-                    correlograms.shape,
-                )
+                unit_a, unit_b = spike_unit_indices[:-shift][m], spike_unit_indices[+shift:][m]
+            # Raveled indices computed in place (cheaper than `np.ravel_multi_index()`,
+            # which also checks the bounds), in int64 whatever the dtype of the labels.
+            indices = unit_a.astype("int64")
+            indices *= num_units
+            indices += unit_b
+            indices *= num_bins
+            indices += spike_diff_b[m]
+            indices += num_half_bins
 
             # Increment the matching spikes in the correlograms array.
-            bbins = np.bincount(indices)
-            correlograms.ravel()[: len(bbins)] += bbins
+            if _HAVE_FAST_ADD_AT:
+                np.add.at(correlograms_flat, indices, 1)
+            else:
+                bbins = np.bincount(indices)
+                correlograms_flat[: len(bbins)] += bbins
 
             if sign == 1:
                 # For positive sign, the end bin is < num_half_bins (e.g.
@@ -512,26 +567,89 @@ def _compute_correlograms_numba(sorting, window_size, bin_size):
     """
     assert HAVE_NUMBA, "numba version of this function requires installation of numba"
 
-    num_bins, num_half_bins = _compute_num_bins(window_size, bin_size)
     num_units = len(sorting.unit_ids)
 
-    spikes = sorting.to_spike_vector(concatenated=False)
-    correlograms = np.zeros((num_units, num_units, num_bins), dtype=np.int64)
-
-    for seg_index in range(sorting.get_num_segments()):
-        spike_times = spikes[seg_index]["sample_index"]
-        spike_unit_indices = spikes[seg_index]["unit_index"]
-
-        _compute_correlograms_one_segment_numba(
-            correlograms,
-            spike_times.astype(np.int64, copy=False),
-            spike_unit_indices.astype(np.int32, copy=False),
-            window_size,
-            bin_size,
-            num_half_bins,
-        )
+    # contiguous copies of the fields of the spike vector, the times are shifted in place below
+    spikes = sorting.to_spike_vector(concatenated=True)
+    spike_times = np.array(spikes["sample_index"], dtype=np.int64)
+    spike_unit_indices = np.ascontiguousarray(spikes["unit_index"], dtype=np.int32)
 
-    return correlograms
+    # All segments are processed in one call: each segment is shifted to start more
+    # than a window size after the last spike of the previous one, so that no pair of
+    # spikes from different segments falls within the window.
+    num_segments = sorting.get_num_segments()
+    if num_segments > 1:
+        segment_slices = np.searchsorted(spikes["segment_index"], np.arange(num_segments + 1))
+        segment_offsets = np.zeros(num_segments, dtype=np.int64)
+        for seg_index in range(1, num_segments):
+            start, stop = segment_slices[seg_index - 1], segment_slices[seg_index]
+            last_time = spike_times[stop - 1] if stop > start else 0
+            segment_offsets[seg_index] = segment_offsets[seg_index - 1] + last_time + window_size + 1
+        spike_times += segment_offsets[spikes["segment_index"]]
+
+    return _correlogram_for_one_segment_numba(spike_times, spike_unit_indices, window_size, bin_size, num_units)
+
+
+def _correlogram_for_one_segment_numba(spike_times, spike_unit_indices, window_size, bin_size, num_units):
+    """
+    Same as `correlogram_for_one_segment()` but using the numba kernel
+    `_compute_correlograms_one_segment_numba()`, which only visits the
+    pairs of spikes within the window.
+
+    Parameters
+    ----------
+    spike_times : np.ndarray
+        An array of spike times (in samples, not seconds), sorted.
+        This contains spikes from all units.
+    spike_unit_indices : np.ndarray
+        An array of labels indicating the unit of the corresponding
+        spike in `spike_times`.
+    window_size : int
+        The window size over which to perform the cross-correlation, in samples.
+        As in `correlogram_for_one_segment()`, it is clipped to a multiple of bin_size.
+    bin_size : int
+        The size of which to bin lags, in samples.
+    num_units : int
+        The number of units.
+
+    Returns
+    -------
+    correlograms : np.array
+        A (num_units, num_units, num_bins) array of correlograms
+        between all units at each lag time bin.
+    """
+    assert HAVE_NUMBA, "numba version of this function requires installation of numba"
+
+    num_bins, num_half_bins = _compute_num_bins(window_size, bin_size)
+    window_size = num_half_bins * bin_size
+
+    spike_times = np.ascontiguousarray(spike_times, dtype=np.int64)
+    spike_unit_indices = np.ascontiguousarray(spike_unit_indices, dtype=np.int32)
+
+    # The counts are accumulated in int32 when it cannot overflow, which halves the memory
+    # traffic to the correlograms array. No bin can hold more counts than the total number
+    # of spike pairs closer than the window size, which is bounded here.
+    num_pairs = np.sum(
+        np.searchsorted(spike_times, spike_times + window_size, side="right")
+        - np.searchsorted(spike_times, spike_times - window_size, side="left")
+    )
+    dtype = np.int32 if num_pairs <= np.iinfo(np.int32).max else np.int64
+
+    correlograms = np.zeros((num_units, num_units, num_bins), dtype=dtype)
+
+    # Index of the bin of every possible lag, offset by window_size. The table is small
+    # (it fits in L1 cache for usual windows) and removes the divisions from the kernel.
+    bin_lut = (np.arange(2 * window_size) // bin_size).astype(np.int32)
+
+    _compute_correlograms_one_segment_numba(
+        correlograms,
+        spike_times,
+        spike_unit_indices,
+        window_size,
+        bin_lut,
+    )
+
+    return correlograms.astype(np.int64, copy=False)
 
 
 if HAVE_NUMBA:
@@ -540,19 +658,18 @@ if HAVE_NUMBA:
     @numba.jit(
         nopython=True,
         nogil=True,
-        cache=False,
+        cache=True,
+        error_model="numpy",
     )
-    def _compute_correlograms_one_segment_numba(
-        correlograms, spike_times, spike_unit_indices, window_size, bin_size, num_half_bins
-    ):
+    def _compute_correlograms_one_segment_numba(correlograms, spike_times, spike_unit_indices, window_size, bin_lut):
         """
         Compute the correlograms using `numba` for speed.
 
         The algorithm works by brute-force iteration through all
         pairs of spikes (skipping those when outside of the window).
-        The spike-time difference and its time bin are computed
-        and stored in a (num_units, num_units, num_bins)
-        correlogram. The correlogram must be passed as an
+        Each pair is visited once, and the spike-time difference and its
+        time bin are computed for both orders of the pair and stored in
+        a (num_units, num_units, num_bins) correlogram. The correlogram must be passed as an
         argument and is filled in-place.
 
         Parameters
@@ -570,40 +687,37 @@ if HAVE_NUMBA:
             spike in `spike_times`.
         window_size : int
             The window size over which to perform the cross-correlation, in samples
-        bin_size : int
-            The size of which to bin lags, in samples.
+        bin_lut : np.ndarray
+            The index of the bin of each lag from -window_size to window_size - 1,
+            i.e. `(np.arange(2 * window_size) // bin_size)`, indexed by lag + window_size.
         """
-        start_j = 0
-        for i in range(spike_times.size):
-            for j in range(start_j, spike_times.size):
-                if i == j:
-                    continue
-
-                diff = spike_times[i] - spike_times[j]
-
-                # When the diff is exactly the window size, keep going
-                # without iterating start_j in case this spike also has
-                # other diffs with other units that == window size.
-                if diff == window_size:
-                    continue
-
-                # if the time of spike i is more than window size later than
-                # spike j, then spike i + 1 will also be more than a window size
-                # later than spike j. Iterate the start_j and check the next spike.
-                if diff > window_size:
-                    start_j += 1
-                    continue
-
-                # If the time of spike i is more than a window size earlier
-                # than spike j, then all following j spikes will be even later
-                # i spikes and so all more than a window size earlier. So move
-                # onto the next i.
+        num_spikes = spike_times.size
+        for i in range(num_spikes):
+            # The counts of the pair (i, j) in the order (i, j) go to the
+            # (num_units, num_bins) slab of the unit of spike i, take it once here.
+            time_i = spike_times[i]
+            unit_i = spike_unit_indices[i]
+            correlograms_i = correlograms[unit_i]
+
+            # Each pair of spikes is visited once, from its earlier spike i, and
+            # counted in both orders. Note that the reversed lag is binned on
+            # its own rather than by mirroring the bin, as a lag that is a multiple
+            # of bin_size does not fall in the mirrored bin.
+            for j in range(i + 1, num_spikes):
+                diff = time_i - spike_times[j]
+
+                # As soon as spike j is more than a window size later than spike i,
+                # all following j spikes are even later, so move onto the next i.
                 if diff < -window_size:
                     break
 
-                bin = diff // bin_size
+                unit_j = spike_unit_indices[j]
 
-                correlograms[spike_unit_indices[i], spike_unit_indices[j], num_half_bins + bin] += 1
+                # A diff of exactly -window_size goes to the first bin, while
+                # the reversed diff of exactly window_size is outside the last bin.
+                correlograms_i[unit_j, bin_lut[window_size + diff]] += 1
+                if diff > -window_size:
+                    correlograms[unit_j, unit_i, bin_lut[window_size - diff]] += 1
 
 
 class ComputeACG3D(AnalyzerExtension):
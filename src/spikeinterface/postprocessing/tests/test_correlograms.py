@@ -104,6 +104,30 @@ def test_equal_results_correlograms(window_and_bin_ms):
     assert np.array_equal(result_numpy, result_numba)
 
 
+@pytest.mark.parametrize("method", ["numpy", param("numba", marks=SKIP_NUMBA)])
+def test_correlograms_unit_missing_in_segment(method):
+    """
+    Check that a segment in which a unit has no spikes does not
+    contribute to the correlograms of this unit.
+    """
+    rng = np.random.default_rng(seed=0)
+    spike_trains = [
+        {"a": np.sort(rng.integers(0, 100000, 500)), "b": np.array([], dtype="int64")},
+        {"a": np.sort(rng.integers(0, 100000, 500)), "b": np.sort(rng.integers(0, 100000, 500))},
+    ]
+    sorting = NumpySorting.from_unit_dict(spike_trains, sampling_frequency=10000.0)
+    sorting_segment1 = NumpySorting.from_unit_dict(spike_trains[1:], sampling_frequency=10000.0)
+
+    correlograms, bins = _compute_correlograms_on_sorting(sorting, window_ms=10.0, bin_ms=1.0, method=method)
+    correlograms_segment1, _ = _compute_correlograms_on_sorting(
+        sorting_segment1, window_ms=10.0, bin_ms=1.0, method=method
+    )
+
+    assert correlograms.shape == (2, 2, bins.size - 1)
+    assert np.array_equal(correlograms[1, :, :], correlograms_segment1[1, :, :])
+    assert np.array_equal(correlograms[:, 1, :], correlograms_segment1[:, 1, :])
+
+
 @pytest.mark.parametrize("method", ["numpy", param("numba", marks=SKIP_NUMBA)])
 def test_flat_cross_correlogram(method):
     """
@@ -1349,12 +1349,16 @@ def slidingRP_violations(
         spike_samples_list = spike_samples
     # compute correlograms
     correlogram = None
+    # the numba kernel only visits the spikes within the window, which is much faster than the
+    # shift loop of the numpy implementation for this long window
     for spike_samples in spike_samples_list:
         c0 = correlogram_for_one_segment(
             spike_samples,
             np.zeros(len(spike_samples), dtype="int8"),
             bin_size=max(int(bin_size_ms / 1000 * sample_rate), 1),  # convert to sample counts
             window_size=int(window_size_s * sample_rate),
+            num_units=1,
+            method="auto",
         )[0, 0]
         if correlogram is None:
             correlogram = c0